@@ -1,4 +1,7 @@
 from openai import OpenAI
+import diskcache
+import hashlib
+import json
 import requests
 from tqdm import tqdm
 import os
@@ -12,37 +15,86 @@ client = OpenAI(
     base_url=BASE_URL,  # Базовый URL API
 )
 
+# Общая HTTP-сессия: соединения переиспользуются между запросами (keep-alive)
+_session = requests.Session()
+_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                  'AppleWebKit/537.36 (KHTML, like Gecko) '
+                  'Chrome/119.0.0.0 Safari/537.36'
+})
+
+SYSTEM_PROMPT = (
+    "Ты помощник, который отвечает строго по содержимому сайта. "
+    "Отвечай кратко, без рассуждений и догадок. "
+    "Не убирай важные данные (ссылки, расписания, даты). "
+    "Не пиши, что дополнительная информация есть на сайте."
+)
+
+# Дисковый кэш ответов LLM: одинаковые запросы не отправляются в API повторно
+_llm_cache = diskcache.Cache('.llm_cache')
+LLM_CACHE_EXPIRE = 7 * 24 * 60 * 60  # Неделя, в секундах
+
+TOKENS_PER_ANSWER = 200  # Лимит токенов на один ответ при пакетной обработке вопросов
 
-def call_llm(prompt: str, model: str = "gpt-4o-mini") -> str:
+
+def _is_complete_json(answer: str, finish_reason: str) -> bool:
+    """Проверяет, что ответ в JSON-режиме не обрезан и разбирается как JSON"""
+    if finish_reason != "stop":
+        return False
+    try:
+        json.loads(answer)
+    except ValueError:
+        return False
+    return True
+
+
+def call_llm(prompt: str, context: str = "", model: str = "gpt-4o-mini", max_tokens: int = 500,
+             json_mode: bool = False) -> str:
     """
     Вызывает языковую модель OpenAI для генерации ответа
 
+    Ответы кэшируются на диске по хэшу модели, системного промпта и запроса.
+    Контекст передается отдельным сообщением перед запросом: начало запроса остается
+    одинаковым для всех вопросов по сайту, и провайдер может кэшировать этот префикс
+
     Args:
         prompt: Текст запроса
+        context: Контент сайта, общий для нескольких запросов
         model: Используемая модель (по умолчанию 'gpt-4o-mini')
+        max_tokens: Максимальная длина ответа в токенах
+        json_mode: Требовать от модели ответ в виде JSON-объекта
 
     Returns:
         Строка с ответом модели
     """
+    key = hashlib.sha256(
+        f"{model}|{max_tokens}|{json_mode}|{SYSTEM_PROMPT}|{context}|{prompt}".encode('utf-8')
+    ).hexdigest()
+    cached = _llm_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # response_format передается только при необходимости: не все совместимые API его поддерживают
+    extra_params = {"response_format": {"type": "json_object"}} if json_mode else {}
+
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    if context:
+        messages.append({"role": "system", "content": f"Контент сайта:\n{context}"})
+    messages.append({"role": "user", "content": prompt})
+
     try:
         response = client.chat.completions.create(
             model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "Ты помощник, который отвечает строго по содержимому сайта. "
-                        "Отвечай кратко, без рассуждений и догадок. "
-                        "Не убирай важные данные (ссылки, расписания, даты). "
-                        "Не пиши, что дополнительная информация есть на сайте."
-                    )
-                },
-                {"role": "user", "content": f"Контент сайта: {prompt}"}
-            ],
-            max_tokens=500,
-            temperature=0.3  # Для более детерминированных ответов
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=0.3,  # Для более детерминированных ответов
+            **extra_params
         )
-        return response.choices[0].message.content.strip()
+        choice = response.choices[0]
+        answer = choice.message.content.strip()
+        if not json_mode or _is_complete_json(answer, choice.finish_reason):
+            _llm_cache.set(key, answer, expire=LLM_CACHE_EXPIRE)
+        return answer
     except Exception as e:
         print(f"Ошибка при вызове LLM: {str(e)}")
 
@@ -57,14 +109,8 @@ def fetch_html_text(url: str) -> str:
     Returns:
         Текст HTML-страницы
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                      'AppleWebKit/537.36 (KHTML, like Gecko) '
-                      'Chrome/119.0.0.0 Safari/537.36'
-    }
-
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = _session.get(url, timeout=30)
         response.raise_for_status()
         return response.text
     except requests.RequestException as e:
@@ -91,6 +137,9 @@ def answer_questions(summary: str, questions: List[str]) -> List[Tuple[str, str]
     """
     Генерирует ответы на список вопросов на основе текста
 
+    Все вопросы отправляются одним запросом, чтобы текст сайта передавался в LLM один раз.
+    Вопросы, на которые модель не вернула ответ, обрабатываются отдельными запросами
+
     Args:
         summary: Текст для анализа
         questions: Список вопросов
@@ -98,14 +147,41 @@ def answer_questions(summary: str, questions: List[str]) -> List[Tuple[str, str]
     Returns:
         Список кортежей (вопрос, ответ)
     """
+    numbered_questions = "\n".join(f"{i}. {question}" for i, question in enumerate(questions, 1))
+    prompt = (
+        f"На основе контента сайта ответь точно на каждый вопрос из списка:\n{numbered_questions}\n\n"
+        f"Если информации нет, напиши 'Информация не найдена'.\n"
+        f'Верни JSON-объект вида {{"answers": [{{"q": номер вопроса, "a": "ответ"}}, ...]}}'
+    )
+    response = call_llm(prompt, context=summary, max_tokens=TOKENS_PER_ANSWER * len(questions), json_mode=True)
+
+    try:
+        items = json.loads(response)["answers"]
+        if not isinstance(items, list):
+            raise TypeError("поле answers не является списком")
+    except (TypeError, ValueError, KeyError) as e:
+        print(f"Не удалось разобрать пакетный ответ LLM: {str(e)}")
+        items = []
+
+    # Пустые и некорректные ответы пропускаются: такие вопросы обрабатываются отдельными запросами
+    batch_answers = {}
+    for item in items:
+        try:
+            answer = item.get("a")
+            if isinstance(answer, str) and answer.strip():
+                batch_answers[int(item["q"])] = answer.strip()
+        except (AttributeError, TypeError, ValueError, KeyError) as e:
+            print(f"Пропущен некорректный элемент пакетного ответа LLM: {str(e)}")
+
     answers = []
-    for question in tqdm(questions, desc="Обработка вопросов", unit="вопрос"):
-        prompt = (
-            f"На основе следующего текста:\n{summary}\n\n"
-            f"Ответь точно на вопрос: {question}\n"
-            f"Если информации нет, напиши 'Информация не найдена'"
-        )
-        answer = call_llm(prompt)
+    for i, question in enumerate(tqdm(questions, desc="Обработка вопросов", unit="вопрос"), 1):
+        answer = batch_answers.get(i)
+        if answer is None:
+            answer = call_llm(
+                f"На основе контента сайта ответь точно на вопрос: {question}\n"
+                f"Если информации нет, напиши 'Информация не найдена'",
+                context=summary
+            )
         answers.append((question, answer))
     return answers
 
@@ -147,7 +223,6 @@ def main(i):
         with open(results_file, "r", encoding="utf-8") as f:
             site_content = f.read()
 
-        site_content.replace("\n", " ")
         # Генерация ответов
         print("\n" + "=" * 50)
         print("Анализ контента и генерация ответов...")
@@ -1,6 +1,8 @@
 import os
 import re
-import json
+import hashlib
+import multiprocessing
+import orjson
 import requests
 import pytesseract
 from io import BytesIO
@@ -8,13 +10,131 @@ from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 from PIL import Image
 import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
+from itertools import repeat
 from typing import List, Dict, Set, Optional, Union
 from PyPDF2 import PdfReader
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+PDF_SPOOL_MAX_MEMORY = 4 * 1024 * 1024
+MAX_FILE_CONTENT_LENGTH = 10000  # Сколько символов текста файла сохраняется для страницы
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Расширения файлов для классификации ссылок
+PDF_EXTS = frozenset({'.pdf'})
+IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp'})
+OCR_IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png'})  # Изображения, которые отправляются на OCR
+
+OCR_ERROR_TEXT = "Ошибка обработки изображения"
+
+# Регулярные выражения для clean_text, компилируются один раз при загрузке модуля
+_RE_CLEAN = re.compile(r'[^\w\s.,:;!?()\-\n]')
+_RE_WS = re.compile(r'\s+')
+
+# Сессия для загрузки изображений, создается отдельно в каждом процессе OCR
+_ocr_session: Optional[requests.Session] = None
+
+
+def _create_session(pool_maxsize: int = 64) -> requests.Session:
+    """
+    Создает HTTP-сессию с общими настройками: User-Agent, пул соединений и повторные попытки
+
+    Используется и парсером, и процессами OCR, чтобы настройки не расходились
+
+    Args:
+        pool_maxsize: Максимальное число соединений в пуле для одного хоста
+
+    Returns:
+        Настроенная сессия requests
+    """
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+
+    adapter = HTTPAdapter(
+        pool_connections=64,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+@lru_cache(maxsize=1)
+def _tesseract_ok() -> bool:
+    """Проверяет доступность Tesseract OCR, запуская его только при первом вызове в процессе"""
+    try:
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception as e:
+        print(f"Ошибка инициализации Tesseract OCR: {e}")
+        return False
+
+
+def extract_text_from_image(img_url: str, ocr_enabled: bool, max_file_size: int) -> str:
+    """
+    Извлекает текст с изображения с помощью OCR
+
+    Функция вынесена на уровень модуля, чтобы ее можно было выполнять в ProcessPoolExecutor
+
+    Args:
+        img_url: URL изображения
+        ocr_enabled: Включено ли распознавание текста
+        max_file_size: Максимальный размер изображения (в байтах)
+
+    Returns:
+        Распознанный текст или сообщение об ошибке
+    """
+    global _ocr_session
+
+    if not ocr_enabled:
+        return "OCR отключен"
+
+    try:
+        # Путь до tesseract
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+        if _ocr_session is None:
+            _ocr_session = _create_session()
+
+        # Загрузка изображения: при stream=True тело не скачивается, пока его не прочитают,
+        # поэтому отклоненный по заголовкам ответ просто закрывается без загрузки
+        with _ocr_session.get(img_url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+
+            # Проверка размера и типа
+            if int(response.headers.get('content-length', 0)) > max_file_size:
+                return "Изображение слишком большое"
+            if 'image' not in response.headers.get('content-type', ''):
+                return "URL не ведет на изображение"
+
+            # Читается не больше max_file_size + 1 байт на случай, если content-length не указан
+            content = response.raw.read(max_file_size + 1, decode_content=True)
+            if len(content) > max_file_size:
+                return "Изображение слишком большое"
+
+        # Распознавание текста прямо из памяти, без временного файла
+        with Image.open(BytesIO(content)) as img:
+            text = pytesseract.image_to_string(img, lang='rus')
+
+        return CompleteWebsiteScraper.clean_text(text) if text.strip() else "Не удалось распознать текст"
+
+    except Exception as e:
+        print(f"Ошибка обработки изображения {img_url}: {str(e)}")
+        return OCR_ERROR_TEXT
 
 
 class CompleteWebsiteScraper:
     def __init__(self, root_url: str, max_pages: int = 50, ocr_enabled: bool = True,
-                 max_file_size: int = 10 * 1024 * 1024, download_documents: bool = False):
+                 max_file_size: int = 10 * 1024 * 1024, download_documents: bool = False,
+                 max_workers: int = 8):
         """
         Инициализация парсера веб-сайтов
 
@@ -24,152 +144,139 @@ class CompleteWebsiteScraper:
             ocr_enabled: Включить распознавание текста с изображений
             max_file_size: Максимальный размер файлов для скачивания (в байтах)
             download_documents: Скачивать документы (PDF, DOCX и т.д.)
+            max_workers: Количество страниц, загружаемых параллельно
         """
         self.root_url = root_url
+        self._root_netloc = urlparse(root_url).netloc
+        # URL, поставленные в очередь обхода (а не уже обработанные страницы):
+        # множество пополняется при постановке в очередь, поэтому его размер - это не счетчик страниц
         self.visited_urls: Set[str] = set()
         self.data: List[Dict] = []
         self.max_pages = max_pages
-        self.ocr_enabled = ocr_enabled
+        self.ocr_enabled = ocr_enabled and _tesseract_ok()
         self.max_file_size = max_file_size
         self.download_documents = download_documents
+        self.max_workers = max_workers
+        self._ocr_cache: Dict[str, str] = {}  # Результаты OCR по URL изображения
+
+        # Настройка сессии requests: пул соединений и повторные попытки задаются один раз на всю сессию
+        self.session = _create_session(pool_maxsize=max(64, self.max_workers))
 
-        # Настройка сессии requests
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
-
-        # Проверка и настройка Tesseract OCR
-        if self.ocr_enabled:
-            try:
-                pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-                pytesseract.get_tesseract_version()
-            except Exception as e:
-                print(f"Ошибка инициализации Tesseract OCR: {e}")
-                self.ocr_enabled = False
+        # Пул процессов для OCR: распознавание нагружает CPU, поэтому изображения обрабатываются параллельно.
+        # max_workers=None - число CPU с учетом ограничения в 61 процесс на Windows.
+        # Пул запускается из потоков обхода, поэтому процессы создаются через spawn, а не fork
+        self.ocr_executor = ProcessPoolExecutor(
+            max_workers=None,
+            mp_context=multiprocessing.get_context('spawn')
+        ) if self.ocr_enabled else None
 
         # Создание папок для сохранения данных
         os.makedirs('downloaded_documents', exist_ok=True)
-        os.makedirs('temp_images', exist_ok=True)
 
     def is_valid_url(self, url: str) -> bool:
         """Проверяет, принадлежит ли URL тому же домену, что и root_url"""
         parsed = urlparse(url)
-        return bool(parsed.netloc) and parsed.netloc == urlparse(self.root_url).netloc
+        return bool(parsed.netloc) and parsed.netloc == self._root_netloc
 
     # Добавить импорт PyPDF2 в начале файла
 
 
     # Обновить метод extract_from_pdf в классе CompleteWebsiteScraper
-    def extract_from_pdf(self, pdf_url: str) -> Dict[str, Optional[str]]:
+    def extract_from_pdf(self, pdf_url: str, max_chars: Optional[int] = None) -> Dict[str, Optional[str]]:
         """
         Извлекает текст из PDF файла
 
         Args:
             pdf_url: URL PDF файла
+            max_chars: Если задан, страницы перестают обрабатываться, как только очищенный
+                текст становится длиннее max_chars
 
         Returns:
             Словарь с текстом и путем к локальному файлу
         """
         try:
-            response = self.session.get(pdf_url, stream=True)
-            if int(response.headers.get('content-length', 0)) > self.max_file_size:
-                return {'text': None, 'local_path': None}
-
-            local_path = self.download_file(pdf_url, 'pdf') if self.download_documents else None
-
-            text = ''
-            with BytesIO(response.content) as pdf_file:
+            # PDF потоково записывается во временный файл, который остается в памяти до 4 МБ
+            with tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_MEMORY) as pdf_file:
+                with self.session.get(pdf_url, stream=True, timeout=30) as response:
+                    response.raise_for_status()
+                    # Размер проверяется по заголовкам, до загрузки тела ответа
+                    if int(response.headers.get('content-length', 0)) > self.max_file_size:
+                        return {'text': None, 'local_path': None}
+
+                    # Размер проверяется и при загрузке, на случай если content-length не указан
+                    size = 0
+                    for chunk in response.iter_content(chunk_size=8192):
+                        size += len(chunk)
+                        if size > self.max_file_size:
+                            return {'text': None, 'local_path': None}
+                        pdf_file.write(chunk)
+
+                # Уже загруженный PDF сохраняется на диск без повторного скачивания
+                local_path = self.save_file(pdf_file, pdf_url, 'pdf') if self.download_documents else None
+
+                text = ''
+                cleaned = None  # Очищенный текст, если обработка остановлена досрочно
+                pdf_file.seek(0)
                 reader = PdfReader(pdf_file)
                 for page in reader.pages:
                     page_text = page.extract_text()
                     if page_text:
                         text += page_text + '\n'
+                        # Остальные страницы не нужны: текст все равно будет обрезан до max_chars
+                        if max_chars is not None and len(text) > max_chars:
+                            cleaned = self.clean_text(text)
+                            if len(cleaned) > max_chars:
+                                break
+                            cleaned = None
 
             return {
-                'text': self.clean_text(text),
+                'text': cleaned if cleaned is not None else self.clean_text(text),
                 'local_path': local_path
             }
         except Exception as e:
             print(f"Ошибка обработки PDF {pdf_url}: {str(e)}")
             return {'text': None, 'local_path': None}
 
-    def download_file(self, url: str, file_type: str) -> Optional[str]:
+    @staticmethod
+    def _document_path(url: str, file_type: str) -> str:
+        """
+        Возвращает путь для сохранения документа
+
+        Имя строится из хэша URL, а не из состояния обхода, которое меняют другие потоки,
+        поэтому разные документы не перезаписывают друг друга
+        """
+        url_hash = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join('downloaded_documents', f"document_{url_hash}_{file_type}.{file_type}")
+
+    def save_file(self, file_obj, url: str, file_type: str) -> Optional[str]:
         """
-        Скачивает файл и сохраняет его на диск
+        Сохраняет уже загруженный файл на диск
 
         Args:
-            url: URL файла для скачивания
+            file_obj: Файловый объект с содержимым
+            url: URL, с которого был загружен файл
             file_type: Тип файла (расширение)
 
         Returns:
             Путь к сохраненному файлу или None при ошибке
         """
         try:
-            response = self.session.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-
-            filename = os.path.join('downloaded_documents',
-                                    f"document_{len(self.visited_urls)}_{file_type}.{file_type}")
-
+            filename = self._document_path(url, file_type)
+            file_obj.seek(0)
             with open(filename, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
+                shutil.copyfileobj(file_obj, f)
             return filename
         except Exception as e:
-            print(f"Ошибка при скачивании файла {url}: {str(e)}")
+            print(f"Ошибка при сохранении файла {url}: {str(e)}")
             return None
 
-    def extract_text_from_image(self, img_url: str) -> str:
-        """
-        Извлекает текст с изображения с помощью OCR
-
-        Args:
-            img_url: URL изображения
-
-        Returns:
-            Распознанный текст или сообщение об ошибке
-        """
-        if not self.ocr_enabled:
-            return "OCR отключен"
-
-        try:
-            # Путь до tesseract
-            pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-
-            # Загрузка изображения
-            response = self.session.get(img_url, stream=True, timeout=60)
-            response.raise_for_status()
-
-            # Проверка размера и типа
-            if int(response.headers.get('content-length', 0)) > self.max_file_size:
-                return "Изображение слишком большое"
-            if 'image' not in response.headers.get('content-type', ''):
-                return "URL не ведет на изображение"
-
-            # Сохранение временного файла
-            temp_img_path = os.path.join('temp_images', os.path.basename(img_url))
-            with open(temp_img_path, 'wb') as f:
-                response.raw.decode_content = True
-                shutil.copyfileobj(response.raw, f)
-
-            # Распознавание текста
-            text = pytesseract.image_to_string(Image.open(temp_img_path), lang='rus')
-            os.remove(temp_img_path)  # Удаление временного файла
-
-            return self.clean_text(text) if text.strip() else "Не удалось распознать текст"
-
-        except Exception as e:
-            print(f"Ошибка обработки изображения {img_url}: {str(e)}")
-            return "Ошибка обработки изображения"
-
-    def clean_text(self, text: str) -> str:
+    @staticmethod
+    def clean_text(text: str) -> str:
         """Очищает текст от лишних символов и форматирования"""
-        text = re.sub(r'[^\w\s.,:;!?()\-\n]', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'-\s+', '', text)
-        return text.strip()
+        text = _RE_CLEAN.sub('', text)
+        text = _RE_WS.sub(' ', text)
+        # После схлопывания пробелов '-\s+' совпадает только с '- ', поэтому регулярка не нужна
+        return text.replace('- ', '').strip()
 
     def extract_metadata(self, soup: BeautifulSoup, url: str) -> Dict:
         """Извлекает метаданные страницы"""
@@ -181,15 +288,15 @@ class CompleteWebsiteScraper:
             'headers': {}
         }
 
-        # Мета-описания
-        if meta_desc := soup.find('meta', attrs={'name': 'description'}):
-            metadata['description'] = meta_desc.get('content')
-        if meta_keywords := soup.find('meta', attrs={'name': 'keywords'}):
-            metadata['keywords'] = meta_keywords.get('content')
-
-        # OpenGraph метаданные
-        for meta in soup.find_all('meta', property=lambda x: x and x.startswith('og:')):
-            metadata['og'][meta['property']] = meta['content']
+        # Мета-описания и OpenGraph метаданные собираются за один обход дерева
+        for meta in soup.find_all('meta'):
+            name = meta.get('name')
+            prop = meta.get('property')
+            if name in ('description', 'keywords'):
+                if metadata[name] is None:
+                    metadata[name] = meta.get('content')
+            elif prop and prop.startswith('og:'):
+                metadata['og'][prop] = meta.get('content')
 
         return metadata
 
@@ -213,25 +320,22 @@ class CompleteWebsiteScraper:
                 links['external'].add(absolute_url)
                 continue
 
-            # Классификация файлов
-            if href.lower().endswith('.pdf'):
+            # Классификация файлов по расширению в пути URL
+            ext = os.path.splitext(urlparse(absolute_url).path)[1].lower()
+            if ext in PDF_EXTS:
                 links['files']['pdf'].add(absolute_url)
-            elif any(href.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']):
+            elif ext in IMAGE_EXTS:
                 links['files']['images'].add(absolute_url)
-            elif '.' in href.split('/')[-1]:
+            elif ext:
                 links['files']['other'].add(absolute_url)
             else:
                 links['internal'].add(absolute_url)
 
         return links
 
-    def scrape_page(self, url: str) -> None:
-        """Рекурсивно парсит страницу и все внутренние ссылки"""
-        if url in self.visited_urls or len(self.visited_urls) >= self.max_pages:
-            return
-
+    def scrape_page(self, url: str) -> List[str]:
+        """Парсит страницу и возвращает найденные на ней внутренние ссылки"""
         print(f"Обработка: {url}")
-        self.visited_urls.add(url)
 
         try:
             response = self.session.get(url, timeout=30)
@@ -239,30 +343,43 @@ class CompleteWebsiteScraper:
 
             if 'text/html' not in response.headers.get('content-type', ''):
                 print(f"Пропуск не-HTML контента: {url}")
-                return
+                return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, 'lxml')
 
             # Удаление ненужных элементов
             for element in soup(['script', 'style', 'iframe', 'noscript']):
                 element.decompose()
 
-            # Извлечение основного текста
-            main_text = '\n'.join(line for line in soup.get_text('\n', strip=True).split('\n') if line.strip())
+            # Извлечение основного текста за один проход: stripped_strings обрезает только края
+            # текстовых узлов, поэтому пустые строки внутри узлов отбрасываются отдельно
+            main_text = '\n'.join(line for s in soup.stripped_strings for line in s.split('\n') if line.strip())
 
             # Извлечение текста с изображений
             img_texts = []
             if self.ocr_enabled:
+                images = []
                 for img in soup.find_all('img', src=True):
                     img_url = urljoin(url, img.get('src'))
-                    if any(img_url.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png']):
-                        ocr_text = self.extract_text_from_image(img_url)
-                        if ocr_text:
-                            img_texts.append({
-                                'url': img_url,
-                                'alt_text': img.get('alt', ''),
-                                'ocr_text': ocr_text
-                            })
+                    if os.path.splitext(urlparse(img_url).path)[1].lower() in OCR_IMAGE_EXTS:
+                        images.append((img_url, img.get('alt', '')))
+
+                # На OCR отправляются только изображения, которые еще не распознавались
+                new_urls = list(dict.fromkeys(img_url for img_url, _ in images if img_url not in self._ocr_cache))
+                ocr_texts = self.ocr_executor.map(extract_text_from_image, new_urls,
+                                                  repeat(self.ocr_enabled), repeat(self.max_file_size))
+                for img_url, ocr_text in zip(new_urls, ocr_texts):
+                    if ocr_text != OCR_ERROR_TEXT:  # Ошибки не кэшируются, чтобы повторить попытку позже
+                        self._ocr_cache[img_url] = ocr_text
+
+                for img_url, alt_text in images:
+                    ocr_text = self._ocr_cache.get(img_url, OCR_ERROR_TEXT)
+                    if ocr_text:
+                        img_texts.append({
+                            'url': img_url,
+                            'alt_text': alt_text,
+                            'ocr_text': ocr_text
+                        })
 
             # Извлечение метаданных и ссылок
             metadata = self.extract_metadata(soup, url)
@@ -271,12 +388,13 @@ class CompleteWebsiteScraper:
             # Обработка PDF файлов
             files_content = []
             for pdf_url in list(links['files']['pdf'])[:3]:  # Ограничиваем количество
-                result = self.extract_from_pdf(pdf_url)
+                result = self.extract_from_pdf(pdf_url, max_chars=MAX_FILE_CONTENT_LENGTH)
                 if result['text']:
                     files_content.append({
                         'type': 'PDF',
                         'url': pdf_url,
-                        'content': result['text'][:10000] + "..." if len(result['text']) > 10000 else result['text'],
+                        'content': (result['text'][:MAX_FILE_CONTENT_LENGTH] + "..."
+                                    if len(result['text']) > MAX_FILE_CONTENT_LENGTH else result['text']),
                         'local_path': result['local_path']
                     })
 
@@ -294,48 +412,72 @@ class CompleteWebsiteScraper:
                 'files_content': files_content
             })
 
-            # Рекурсивный обход внутренних ссылок
-            for link in list(links['internal'])[:5]:  # Ограничиваем количество
-                self.scrape_page(link)
+            return list(links['internal'])
 
         except Exception as e:
             print(f"Ошибка при обработке {url}: {str(e)}")
+            return []
 
     def run(self) -> List[Dict]:
-        """Запускает парсинг сайта"""
-        self.scrape_page(self.root_url)
+        """Запускает обход сайта в ширину, обрабатывая до max_workers страниц параллельно"""
+        # URL помечается посещенным при постановке в очередь, поэтому дубликаты в нее не попадают
+        frontier = deque([self.root_url])
+        self.visited_urls.add(self.root_url)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            while frontier or pending:
+                while frontier and len(pending) < self.max_workers:
+                    pending.add(executor.submit(self.scrape_page, frontier.popleft()))
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for link in future.result():
+                        if link not in self.visited_urls and len(self.visited_urls) < self.max_pages:
+                            self.visited_urls.add(link)
+                            frontier.append(link)
         return self.data
 
+    def close(self) -> None:
+        """Освобождает ресурсы парсера: пул процессов OCR и HTTP-сессию"""
+        if self.ocr_executor is not None:
+            self.ocr_executor.shutdown()
+            self.ocr_executor = None
+        self.session.close()
+
     def save_results(self, output_dir: str = 'scrape_results') -> None:
         """Сохраняет результаты в JSON и текстовый файл"""
         os.makedirs(output_dir, exist_ok=True)
 
-        # Сохранение в JSON
-        with open(os.path.join(output_dir, 'full_data.json'), 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=4)
+        # Сохранение в JSON: orjson сразу возвращает байты в UTF-8
+        with open(os.path.join(output_dir, 'full_data.json'), 'wb') as f:
+            f.write(orjson.dumps(self.data, option=orjson.OPT_INDENT_2))
 
-        # Сохранение в текстовый файл
-        with open(os.path.join(output_dir, 'full_data.txt'), 'w', encoding='utf-8') as f:
-            for page in self.data:
-                f.write(f"\n{'=' * 80}\nURL: {page['url']}\n{'=' * 80}\n\n")
+        # Сохранение в текстовый файл: текст собирается по частям и записывается одним вызовом
+        parts = []
+        for page in self.data:
+            parts.append(f"\n{'=' * 80}\nURL: {page['url']}\n{'=' * 80}\n\n")
 
-                if page['metadata']['title']:
-                    f.write(f"Заголовок: {page['metadata']['title']}\n")
+            if page['metadata']['title']:
+                parts.append(f"Заголовок: {page['metadata']['title']}\n")
 
-                f.write(f"\nОсновной текст:\n{page['text']}\n")
+            parts.append(f"\nОсновной текст:\n{page['text']}\n")
 
-                if page['images']:
-                    f.write("\nТекст с изображений:\n")
-                    for img in page['images']:
-                        f.write(f"\nИзображение: {img['url']}\n")
-                        if img['alt_text']:
-                            f.write(f"Описание: {img['alt_text']}\n")
-                        f.write(f"Текст: {img['ocr_text']}\n")
+            if page['images']:
+                parts.append("\nТекст с изображений:\n")
+                for img in page['images']:
+                    parts.append(f"\nИзображение: {img['url']}\n")
+                    if img['alt_text']:
+                        parts.append(f"Описание: {img['alt_text']}\n")
+                    parts.append(f"Текст: {img['ocr_text']}\n")
 
-                if page['files_content']:
-                    f.write("\nСодержимое файлов:\n")
-                    for file in page['files_content']:
-                        f.write(f"\nФайл: {file['url']}\n{file['content']}\n")
+            if page['files_content']:
+                parts.append("\nСодержимое файлов:\n")
+                for file in page['files_content']:
+                    parts.append(f"\nФайл: {file['url']}\n{file['content']}\n")
+
+        with open(os.path.join(output_dir, 'full_data.txt'), 'w', encoding='utf-8') as f:
+            f.write(''.join(parts))
 
 
 def start(url: str) -> None:
@@ -353,7 +495,10 @@ def start(url: str) -> None:
     )
 
     print("Начало сканирования сайта...")
-    scraper.run()
+    try:
+        scraper.run()
+    finally:
+        scraper.close()
     scraper.save_results()
 
     print("\nСканирование завершено!")